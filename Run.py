@@ -1,30 +1,23 @@
+import asyncio
 import sys
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).resolve().parent / "src"))
 
-from newsbot.Scraper import Scraper
-from newsbot.Summarizer import Summarizer
-from newsbot.ArticleEvaluator import ArticleEvaluator
+from newsbot.DigestPipeline import DigestPipeline
 
 if __name__ == "__main__":
-    url = "https://www.utsa.edu/today/2025/07/story/AI-for-everyone-camp.html"
-    scraper = Scraper(url)
-    page = scraper.run()
-
-    if page["content"]:
-        print("Title:", page["title"])
-        summarizer = Summarizer(url)
-        summary = summarizer.run(page["content"])
-        if summary:
-            print("Summary:", summary)
-
-        ArticleEvaluator = ArticleEvaluator()
-        rating = ArticleEvaluator.evaluate(
-            title=page["title"],
-            content=page["content"],
-            interest="Artificial Intelligence",
-            user_type="Power User",
-        )
-        if rating is not None:
-            print("Rating:", rating)
+    urls = sys.argv[1:] or [
+        "https://www.utsa.edu/today/2025/07/story/AI-for-everyone-camp.html"
+    ]
+    pipeline = DigestPipeline(
+        interest="Artificial Intelligence",
+        user_type="Power User",
+    )
+    for entry in asyncio.run(pipeline.run(urls)):
+        print("URL:", entry["url"])
+        print("Title:", entry["title"])
+        if entry["summary"]:
+            print("Summary:", entry["summary"])
+        if entry["rating"] is not None:
+            print("Rating:", entry["rating"])
@@ -1,13 +1,125 @@
-import re
 import logging
+from functools import cached_property, lru_cache
 from typing import Union
-from transformers import pipeline
+import torch
+from transformers import AutoModelForCausalLM, AutoTokenizer, BitsAndBytesConfig
 from newsbot.device_config import DeviceManager
 from newsbot import log_config  # Ensure logging is configured
+from newsbot.cache_config import cache, make_key
+from newsbot.model_cache import (
+    load_or_save_model,
+    load_or_save_pretrained,
+    model_path,
+)
 
 
 logger = logging.getLogger(__name__)
 
+_PROMPT_HEADER = (
+    "You are a senior news editor evaluating an article for a specific reader. \n"
+    "Rate the article strictly on a scale of 1 to 10 based on the following criteria:\n\n"
+    "- Clarity and relevance of the article\n"
+    "- The user's interest area\n"
+    "- The user's expertise level (Power User or Basic User)\n\n"
+    "Do NOT provide any explanation. Only output the rating as a single number (e.g., 7).\n\n"
+    "Guidelines:\n"
+    "- For a Power User, prioritize articles that are technical, in-depth, and impactful.\n"
+    "- For a Basic User, prioritize articles that are simple, clear, and essential for general awareness.\n\n"
+)
+
+
+def _compile_model(model, tokenizer, device: torch.device) -> None:
+    """
+    Compiles the model's forward pass with torch.compile and runs one warm-up forward so
+    compilation happens at load time rather than on the first article. Falls back to eager
+    execution if the backend cannot compile for `device`.
+
+    The default mode is used rather than CUDA graphs: every prompt has a different length, so
+    graphs would be recorded per shape instead of replayed.
+
+    Args:
+        model: The causal language model to compile in place.
+        tokenizer: The tokenizer used to build the warm-up input.
+        device (torch.device): The device the model runs on.
+    """
+    eager_forward = model.forward
+    model.forward = torch.compile(eager_forward, dynamic=True)
+    try:
+        with torch.inference_mode():
+            model(**tokenizer("Warm-up.", return_tensors="pt").to(model.device))
+    except Exception as e:
+        logger.warning(f"torch.compile failed on {device}, running eager: {e}")
+        model.forward = eager_forward
+
+
+@lru_cache(maxsize=None)
+def _get_tokenizer(model_name: str):
+    """
+    Loads the tokenizer once per model name and reuses it for every later ArticleEvaluator.
+    Decoder-only models continue from the last position, so batches are padded on the left.
+
+    Args:
+        model_name (str): The name or path of the language model whose tokenizer to load.
+
+    Returns:
+        The tokenizer, configured for left padding.
+    """
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    tokenizer.padding_side = "left"
+    if tokenizer.pad_token is None:
+        tokenizer.pad_token = tokenizer.eos_token
+    return tokenizer
+
+
+@lru_cache(maxsize=None)
+def _get_model(model_name: str, device: torch.device):
+    """
+    Loads the causal language model once per (model_name, device) and reuses it
+    for every later ArticleEvaluator in the process, so the weights are only loaded once.
+
+    On CUDA the weights are quantized to 4-bit NF4 with bitsandbytes, which cuts the bytes read
+    per generated token roughly fourfold. bitsandbytes kernels are CUDA-only, so MPS and CPU
+    load the unquantized model. The forward pass is then compiled with torch.compile.
+
+    The quantized checkpoint (CUDA) or the pickled model (MPS/CPU) is persisted under the model
+    cache directory after the first load, so later processes skip quantization and `from_pretrained`.
+
+    Args:
+        model_name (str): The name or path of the language model to load.
+        device (torch.device): The device for running the model.
+
+    Returns:
+        The model in eval mode.
+    """
+    logger.info(f"Loading text-generation model {model_name} on {device}")
+    if device.type == "cuda":
+        quantization_config = BitsAndBytesConfig(
+            load_in_4bit=True,
+            bnb_4bit_compute_dtype=torch.bfloat16,
+            bnb_4bit_quant_type="nf4",
+        )
+        model = load_or_save_pretrained(
+            model_path(model_name, "-nf4"),
+            # The saved config carries the quantization settings.
+            lambda path: AutoModelForCausalLM.from_pretrained(
+                path, device_map={"": str(device)}
+            ),
+            lambda: AutoModelForCausalLM.from_pretrained(
+                model_name,
+                quantization_config=quantization_config,
+                device_map={"": str(device)},
+            ),
+        )
+    else:
+        model = load_or_save_model(
+            model_path(model_name, ".pt"),
+            lambda: AutoModelForCausalLM.from_pretrained(model_name),
+            device,
+        )
+    model.eval()
+    _compile_model(model, _get_tokenizer(model_name), device)
+    return model
+
 
 class ArticleEvaluator:
     """
@@ -16,16 +128,39 @@ class ArticleEvaluator:
 
     Attributes:
         model_name (str): The name or path of the language model to use for evaluation.
-        model: The instantiated text-generation pipeline for generating article ratings.
+        device (torch.device): The device the model runs on.
+        model: The causal language model (4-bit quantized on CUDA) for scoring article ratings,
+            loaded on first access.
+        tokenizer: The tokenizer matching `model`.
+        rating_token_ids (dict): Maps each rating from 1 to 10 that the tokenizer encodes as a
+            single token to that token's id.
+        candidate_ratings (list[int]): The keys of `rating_token_ids`, in order.
+        candidate_ids (torch.Tensor): The values of `rating_token_ids` on the model's device.
+        zero_token_id (int): The token id of "0", used when "10" spans two tokens.
     """
 
     def __init__(self, model_name: str = "HuggingFaceTB/SmolLM3-3B"):
         self.model_name = model_name
-        self.model = pipeline(
-            "text-generation",
-            model=self.model_name,
-            device=DeviceManager.get_torch_device(),
+        self.device = DeviceManager.get_torch_device()
+        self.tokenizer = _get_tokenizer(self.model_name)
+        self.rating_token_ids = {}
+        for rating in range(1, 11):
+            token_ids = self.tokenizer.encode(str(rating), add_special_tokens=False)
+            if len(token_ids) == 1:
+                self.rating_token_ids[rating] = token_ids[0]
+        self.candidate_ratings = list(self.rating_token_ids)
+        self.candidate_ids = torch.tensor(
+            list(self.rating_token_ids.values()), device=self.device
         )
+        self.zero_token_id = self.tokenizer.encode("0", add_special_tokens=False)[0]
+
+    @cached_property
+    def model(self):
+        """
+        Loads the model on first use, so an ArticleEvaluator that never scores (e.g., when
+        every rating is already cached) never loads the weights.
+        """
+        return _get_model(self.model_name, self.device)
 
     def _build_prompt(
         self, title: str, content: str, interest: str, user_type: str
@@ -45,21 +180,36 @@ class ArticleEvaluator:
             guidelines for different user types.
         """
         return (
-            "You are a senior news editor evaluating an article for a specific reader. \n"
-            "Rate the article strictly on a scale of 1 to 10 based on the following criteria:\n\n"
-            "- Clarity and relevance of the article\n"
-            "- The user's interest area\n"
-            "- The user's expertise level (Power User or Basic User)\n\n"
-            "Do NOT provide any explanation. Only output the rating as a single number (e.g., 7).\n\n"
-            "Guidelines:\n"
-            "- For a Power User, prioritize articles that are technical, in-depth, and impactful.\n"
-            "- For a Basic User, prioritize articles that are simple, clear, and essential for general awareness.\n\n"
+            f"{_PROMPT_HEADER}"
             f"Title: {title.strip()}\n\n"
             f"Article Content: {content.strip()}\n\n"
             f"User Interest: {interest.strip()}\n\n"
             f"User Type: {user_type.strip()}\n"
         )
 
+    def _format_prompt(self, prompt: str) -> str:
+        """
+        Ends the prompt at the answer slot, so the next token the model predicts is the rating.
+
+        Chat models get the prompt as a user turn followed by the start of the assistant turn,
+        with thinking disabled so the reply opens with the answer. Models without a chat template
+        get a trailing "Rating:" cue instead.
+
+        Args:
+            prompt (str): The evaluation prompt, as returned by `_build_prompt`.
+
+        Returns:
+            str: The text to feed to the model.
+        """
+        if self.tokenizer.chat_template:
+            return self.tokenizer.apply_chat_template(
+                [{"role": "user", "content": prompt}],
+                tokenize=False,
+                add_generation_prompt=True,
+                enable_thinking=False,
+            )
+        return f"{prompt}Rating: "
+
     def evaluate(
         self, title: str, content: str, interest: str, user_type: str
     ) -> Union[int, None]:
@@ -78,16 +228,104 @@ class ArticleEvaluator:
         logger.info(f"Starting article evaluation for: '{title.strip()}'")
         prompt = self._build_prompt(title, content, interest, user_type)
         try:
-            output = self.model(prompt, max_length=10, do_sample=False)
-            if isinstance(output, list) and len(output) > 0:
-                generated_text = output[0].get("generated_text") or output[0].get(
-                    "text"
-                )
-                if generated_text:
-                    response = generated_text.strip()
-                    match = re.search(r"\b(10|[1-9])\b", response)
-                    if match:
-                        return int(match.group(1))
+            return self._score_ratings([prompt])[0]
         except Exception as e:
             logger.error(f"Error evaluating article {title}: {e}", exc_info=True)
         return None
+
+    def evaluate_batch(
+        self, articles: list[dict], batch_size: int = 8
+    ) -> list[Union[int, None]]:
+        """
+        Evaluates several articles, batching their prompts through the model.
+
+        Prompts are sorted by length before batching so that each batch pads to a similar size.
+
+        Args:
+            articles (list[dict]): Dictionaries with 'title', 'content', 'interest' and
+                'user_type' keys, as accepted by `evaluate`.
+            batch_size (int, optional): The number of prompts per forward pass. Defaults to 8.
+
+        Returns:
+            list[Union[int, None]]: The ratings in the same order as `articles`; None for
+            articles that could not be rated.
+        """
+        logger.info(f"Starting batch evaluation of {len(articles)} article(s)")
+        prompts = [self._build_prompt(**article) for article in articles]
+        ratings = [None] * len(prompts)
+        order = sorted(range(len(prompts)), key=lambda i: len(prompts[i]))
+        for start in range(0, len(order), batch_size):
+            indices = order[start : start + batch_size]
+            try:
+                batch = self._score_ratings([prompts[i] for i in indices])
+            except Exception as e:
+                logger.error(f"Error evaluating article batch: {e}", exc_info=True)
+                continue
+            for i, rating in zip(indices, batch):
+                ratings[i] = rating
+        return ratings
+
+    def _score_ratings(self, prompts: list[str]) -> list[Union[int, None]]:
+        """
+        Rates a batch of prompts with a single prefill instead of autoregressive generation.
+
+        Each prompt is cut off at the answer slot (see `_format_prompt`). The logits there are
+        restricted to the rating tokens and the most likely one is taken, which matches greedy
+        decoding of the first answer token. When "10" is not a single token and "1" wins, one
+        extra cached decoding step checks whether the model would continue with "0". Ratings
+        already on disk for the same prompt and model are not recomputed.
+
+        Args:
+            prompts (list[str]): The evaluation prompts.
+
+        Returns:
+            list[Union[int, None]]: The rating for each prompt.
+        """
+        texts = [self._format_prompt(prompt) for prompt in prompts]
+        keys = [make_key("rating", self.model_name, text) for text in texts]
+        ratings = [cache.get(key) for key in keys]
+        missing = [i for i, rating in enumerate(ratings) if rating is None]
+        if not missing:
+            return ratings
+
+        inputs = self.tokenizer(
+            [texts[i] for i in missing],
+            padding=True,
+            # The chat template already adds the special tokens.
+            add_special_tokens=not self.tokenizer.chat_template,
+            return_tensors="pt",
+        ).to(self.model.device)
+        # Left padding shifts each row, so positions are counted over real tokens only.
+        position_ids = inputs["attention_mask"].cumsum(-1) - 1
+        position_ids.masked_fill_(inputs["attention_mask"] == 0, 1)
+        with torch.inference_mode():
+            outputs = self.model(
+                **inputs, position_ids=position_ids, use_cache=True, logits_to_keep=1
+            )
+            best = outputs.logits[:, -1, self.candidate_ids].argmax(dim=-1).tolist()
+            scores = [self.candidate_ratings[b] for b in best]
+
+            if 10 not in self.rating_token_ids and 1 in scores:
+                # "10" spans two tokens: feed "1" and see if "0" is the greedy next token.
+                step_ids = torch.full_like(
+                    inputs["input_ids"][:, :1], self.rating_token_ids[1]
+                )
+                step = self.model(
+                    input_ids=step_ids,
+                    attention_mask=torch.cat(
+                        [inputs["attention_mask"], torch.ones_like(step_ids)], dim=-1
+                    ),
+                    position_ids=position_ids[:, -1:] + 1,
+                    past_key_values=outputs.past_key_values,
+                    use_cache=True,
+                )
+                next_ids = step.logits[:, -1].argmax(dim=-1).tolist()
+                scores = [
+                    10 if score == 1 and next_id == self.zero_token_id else score
+                    for score, next_id in zip(scores, next_ids)
+                ]
+
+        for i, score in zip(missing, scores):
+            ratings[i] = score
+            cache.set(keys[i], score)
+        return ratings
@@ -0,0 +1,201 @@
+import asyncio
+import contextlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+import torch
+from newsbot.ArticleEvaluator import ArticleEvaluator
+from newsbot.Scraper import Scraper
+from newsbot.Summarizer import Summarizer
+from newsbot.device_config import DeviceManager
+from newsbot import log_config  # Ensure logging is configured
+
+logger = logging.getLogger(__name__)
+
+
+class DigestPipeline:
+    """
+    Runs scraping, summarization and evaluation as three overlapping stages connected by
+    asyncio queues, so pages are summarized while others are still downloading and batches
+    are rated while the next ones are being summarized.
+
+    Each model stage runs in its own single-thread executor and, on CUDA, on its own CUDA
+    stream, so the evaluator's kernels for one batch can overlap the summarizer's for the next.
+
+    Attributes:
+        interest (str): The user's area of interest, passed to the evaluator.
+        user_type (str): The type of user ("Power User" or "Basic User").
+        batch_size (int): The maximum number of articles per model batch.
+        batch_timeout (float): Seconds to wait for a batch to fill before running it anyway.
+        max_concurrency (int): The maximum number of page requests in flight.
+    """
+
+    def __init__(
+        self,
+        interest: str,
+        user_type: str,
+        batch_size: int = 4,
+        batch_timeout: float = 0.1,
+        max_concurrency: int = 10,
+    ):
+        self.interest = interest
+        self.user_type = user_type
+        self.batch_size = batch_size
+        self.batch_timeout = batch_timeout
+        self.max_concurrency = max_concurrency
+        self._summarizer = None
+        self._evaluator = None
+
+    @staticmethod
+    def _new_stream():
+        """
+        Returns a dedicated CUDA stream for a model stage, or None when not running on CUDA.
+        """
+        if DeviceManager.get_torch_type() == "cuda":
+            return torch.cuda.Stream()
+        return None
+
+    @staticmethod
+    def _on_stream(stream):
+        """
+        Returns a context that runs CUDA work on `stream`, or a no-op when `stream` is None.
+        """
+        return torch.cuda.stream(stream) if stream else contextlib.nullcontext()
+
+    async def _next_batch(self, queue: asyncio.Queue) -> tuple:
+        """
+        Collects up to `batch_size` items, waiting at most `batch_timeout` after the first one.
+
+        Args:
+            queue (asyncio.Queue): The stage input; None marks the end of the input.
+
+        Returns:
+            tuple: A tuple (batch, done) where `done` is True once the end marker was read.
+        """
+        item = await queue.get()
+        if item is None:
+            return [], True
+        batch = [item]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.batch_timeout
+        while len(batch) < self.batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    async def _scraper_worker(self, urls: list[str], output: asyncio.Queue) -> None:
+        """
+        Fetches all URLs concurrently and queues each parsed page that has content.
+        """
+        loop = asyncio.get_running_loop()
+        async for url, html in Scraper.iter_fetch(urls, self.max_concurrency):
+            page = await loop.run_in_executor(None, Scraper(url).parse, html)
+            if page["content"]:
+                await output.put((url, page))
+        await output.put(None)
+
+    def _summarize(self, batch: list, stream) -> list[str]:
+        """
+        Summarizes a batch of (url, page) items on the summarizer's thread and stream.
+        """
+        with self._on_stream(stream):
+            if self._summarizer is None:
+                self._summarizer = Summarizer()
+            return self._summarizer.run_batch(
+                [page["content"] for _, page in batch],
+                self.batch_size,
+                [url for url, _ in batch],
+            )
+
+    async def _summarizer_worker(
+        self, executor: ThreadPoolExecutor, source: asyncio.Queue, output: asyncio.Queue
+    ) -> None:
+        """
+        Summarizes pages in batches and queues (url, page, summary) items.
+        """
+        loop = asyncio.get_running_loop()
+        stream = self._new_stream()
+        done = False
+        while not done:
+            batch, done = await self._next_batch(source)
+            if not batch:
+                continue
+            summaries = await loop.run_in_executor(
+                executor, self._summarize, batch, stream
+            )
+            for (url, page), summary in zip(batch, summaries):
+                await output.put((url, page, summary))
+        await output.put(None)
+
+    def _evaluate(self, batch: list, stream) -> list:
+        """
+        Rates a batch of (url, page, summary) items on the evaluator's thread and stream.
+        """
+        with self._on_stream(stream):
+            if self._evaluator is None:
+                self._evaluator = ArticleEvaluator()
+            return self._evaluator.evaluate_batch(
+                [
+                    {
+                        "title": page["title"],
+                        "content": page["content"],
+                        "interest": self.interest,
+                        "user_type": self.user_type,
+                    }
+                    for _, page, _ in batch
+                ],
+                self.batch_size,
+            )
+
+    async def _evaluator_worker(
+        self, executor: ThreadPoolExecutor, source: asyncio.Queue, results: dict
+    ) -> None:
+        """
+        Rates summarized pages in batches and records the finished digest entries.
+        """
+        loop = asyncio.get_running_loop()
+        stream = self._new_stream()
+        done = False
+        while not done:
+            batch, done = await self._next_batch(source)
+            if not batch:
+                continue
+            ratings = await loop.run_in_executor(
+                executor, self._evaluate, batch, stream
+            )
+            for (url, page, summary), rating in zip(batch, ratings):
+                results[url] = {
+                    "url": url,
+                    "title": page["title"],
+                    "summary": summary,
+                    "rating": rating,
+                }
+
+    async def run(self, urls: list[str]) -> list[dict]:
+        """
+        Builds the digest entries for the given URLs.
+
+        Args:
+            urls (list[str]): The article URLs.
+
+        Returns:
+            list[dict]: One dictionary with 'url', 'title', 'summary' and 'rating' keys per
+            page that yielded content, in the order of `urls`.
+        """
+        logger.info(f"Starting digest pipeline for {len(urls)} URL(s)")
+        contents, summarized, results = asyncio.Queue(), asyncio.Queue(), {}
+        with ThreadPoolExecutor(max_workers=1) as summarize_executor:
+            with ThreadPoolExecutor(max_workers=1) as evaluate_executor:
+                await asyncio.gather(
+                    self._scraper_worker(urls, contents),
+                    self._summarizer_worker(summarize_executor, contents, summarized),
+                    self._evaluator_worker(evaluate_executor, summarized, results),
+                )
+        return [results[url] for url in dict.fromkeys(urls) if url in results]
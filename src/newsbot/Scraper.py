@@ -1,73 +1,201 @@
+import asyncio
 import logging
+import re
+from typing import AsyncIterator, Union
+import httpx
 import requests
-from bs4 import BeautifulSoup
+from lxml import etree
+from lxml import html as lxml_html
 from readability import Document
+from readability.htmls import build_doc
 from newsbot import log_config  # Ensure logging is configured
+from newsbot.cache_config import HTML_EXPIRE_SECONDS, cache, make_key
 
 logger = logging.getLogger(__name__)
 
+# Article text sits near the top of the page; anything past this is mostly embedded media.
+MAX_HTML_BYTES = 2_000_000
+CHUNK_SIZE = 65536
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
 
 class Scraper:
     def __init__(self, url: str):
         self.url = url
 
-    def _fetch_html(self) -> str:
+    @staticmethod
+    def _load_cached(url: str) -> Union[bytes, None]:
+        """
+        Returns the HTML of `url` if it was fetched within the last hour, otherwise None.
+        """
+        html = cache.get(make_key("html", url))
+        if html is not None:
+            logger.info(f"Page loaded from cache: {url}")
+        return html
+
+    @staticmethod
+    def _append_chunk(data: bytearray, chunk: bytes) -> bool:
+        """
+        Appends a streamed chunk to `data` and returns False once `MAX_HTML_BYTES` is reached.
+        """
+        data += chunk
+        return len(data) < MAX_HTML_BYTES
+
+    @staticmethod
+    def _store(url: str, data: bytearray) -> bytes:
+        """
+        Caches the streamed body of `url`, cut off at `MAX_HTML_BYTES`, and returns it.
+        """
+        html = bytes(data[:MAX_HTML_BYTES])
+        logger.info(f"Page fetched successfully: {url}")
+        cache.set(make_key("html", url), html, expire=HTML_EXPIRE_SECONDS)
+        return html
+
+    def _fetch_html(self) -> bytes:
         """
-        Fetches the HTML content of the page at the specified URL.
+        Fetches the raw HTML bytes of the page at the specified URL.
+        The body is streamed and cut off after `MAX_HTML_BYTES`; decoding is left to the parser.
+        Pages fetched within the last hour are served from the disk cache.
 
         Returns:
-            str: The HTML content of the page if successful, otherwise an empty string.
+            bytes: The HTML content of the page if successful, otherwise empty bytes.
         """
+        html = self._load_cached(self.url)
+        if html is not None:
+            return html
+
         try:
-            response = requests.get(self.url, timeout=10)
-            response.raise_for_status()
-            logger.info(f"Page fetched successfully: {self.url}")
-            return response.text
+            with requests.get(self.url, timeout=10, stream=True) as response:
+                response.raise_for_status()
+                data = bytearray()
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    if not self._append_chunk(data, chunk):
+                        break
+            return self._store(self.url, data)
 
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching the page {self.url}: {e}")
-            return ""
+            return b""
+
+    @staticmethod
+    async def _afetch(
+        url: str, client: httpx.AsyncClient, semaphore: asyncio.Semaphore
+    ) -> bytes:
+        """
+        Asynchronously fetches the raw HTML bytes of a single URL.
+        The body is streamed and cut off after `MAX_HTML_BYTES`; decoding is left to the parser.
+        Pages fetched within the last hour are served from the disk cache.
+
+        Args:
+            url (str): The URL to fetch.
+            client (httpx.AsyncClient): The shared client whose connection pool is reused.
+            semaphore (asyncio.Semaphore): Bounds the number of requests in flight.
+
+        Returns:
+            bytes: The HTML content of the page if successful, otherwise empty bytes.
+        """
+        html = Scraper._load_cached(url)
+        if html is not None:
+            return html
+
+        async with semaphore:
+            try:
+                async with client.stream("GET", url, timeout=10) as response:
+                    response.raise_for_status()
+                    data = bytearray()
+                    async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                        if not Scraper._append_chunk(data, chunk):
+                            break
+                return Scraper._store(url, data)
+            except (httpx.HTTPError, httpx.InvalidURL) as e:
+                logger.error(f"Error fetching the page {url}: {e}")
+                return b""
+
+    @staticmethod
+    async def fetch_many(urls: list[str], max_concurrency: int = 10) -> dict:
+        """
+        Fetches the HTML content of several URLs concurrently over one HTTP/2 connection pool,
+        collecting the pages yielded by `iter_fetch`.
+
+        Args:
+            urls (list[str]): The URLs to fetch.
+            max_concurrency (int, optional): The maximum number of requests in flight. Defaults to 10.
 
-    def _extract_text(self, html: str) -> str:
+        Returns:
+            dict: A mapping of each URL to its raw HTML bytes, or empty bytes on failure.
+        """
+        pages = {
+            url: html async for url, html in Scraper.iter_fetch(urls, max_concurrency)
+        }
+        return {url: pages[url] for url in urls}
+
+    @staticmethod
+    async def iter_fetch(
+        urls: list[str], max_concurrency: int = 10
+    ) -> AsyncIterator[tuple]:
+        """
+        Fetches several URLs concurrently over one HTTP/2 connection pool, yielding each page
+        as soon as it arrives so that downstream work can start before the slowest request
+        finishes.
+
+        Args:
+            urls (list[str]): The URLs to fetch.
+            max_concurrency (int, optional): The maximum number of requests in flight. Defaults to 10.
+
+        Yields:
+            tuple: A tuple (url, html) in completion order; html is empty bytes on failure.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        async with httpx.AsyncClient(http2=True, follow_redirects=True) as client:
+
+            async def fetch(url: str) -> tuple:
+                return url, await Scraper._afetch(url, client, semaphore)
+
+            for page in asyncio.as_completed([fetch(url) for url in urls]):
+                yield await page
+
+    def _extract_text(self, tree: lxml_html.HtmlElement) -> str:
         """
-        Extracts and returns the visible text content from the provided HTML string.
+        Extracts and returns the visible text content from the parsed page.
 
-        This method parses the HTML, removes all <script> and <style> elements, and then extracts the visible text.
+        This method hands the parsed tree to readability, which works on its own copy and keeps the
+        cleaned article as an lxml tree, so the summary HTML is never rendered and parsed again.
+        All <script> and <style> elements are removed with lxml's C-level `strip_elements`, and the
+        visible text is extracted with whitespace collapsed.
         If an error occurs during parsing, it logs the error and returns an empty string.
 
         Args:
-            html (str): The HTML content as a string.
+            tree (lxml.html.HtmlElement): The parsed page.
 
         Returns:
             str: The extracted visible text, or an empty string if parsing fails.
         """
         try:
-            doc = Document(html)
-            html = doc.summary()
-            soup = BeautifulSoup(html, "html.parser")
-            for tag in soup(["script", "style"]):
-                tag.decompose()
-            visible_text = soup.get_text(separator=" ", strip=True)
+            doc = Document(tree)
+            doc.summary()
+            root = doc.html
+            etree.strip_elements(root, "script", "style", with_tail=False)
+            visible_text = _WHITESPACE_RE.sub(" ", " ".join(root.itertext())).strip()
             logger.info(f"Page content parsed successfully: {self.url}")
             return visible_text
         except Exception as e:
             logging.error(f"Error parsing HTML from {self.url}: {e}")
             return ""
 
-    def _extract_title(self, html: str) -> str:
+    def _extract_title(self, tree: lxml_html.HtmlElement) -> str:
         """
-        Extracts and returns the title from the provided HTML string.
+        Extracts and returns the title from the parsed page.
 
         Args:
-            html (str): The HTML content as a string.
+            tree (lxml.html.HtmlElement): The parsed page.
 
         Returns:
             str: The page title, or an empty string if not found or on error.
         """
         try:
-            soup = BeautifulSoup(html, "html.parser")
-            title_tag = soup.find("title")
-            title = title_tag.get_text(strip=True) if title_tag else ""
+            title_tag = tree.find(".//title")
+            title = title_tag.text_content().strip() if title_tag is not None else ""
             logger.info(f"Page title parsed successfully: {self.url}")
             return title
         except Exception as e:
@@ -84,12 +212,32 @@ class Scraper:
         """
 
         logger.info(f"Starting scraper for URL: {self.url}")
-        html = self._fetch_html()
+        return self.parse(self._fetch_html())
+
+    def parse(self, html: bytes) -> dict:
+        """
+        Extracts the title and visible text content from already fetched HTML.
+        The page is parsed once and the tree is shared by the title and text extraction.
+
+        Args:
+            html (bytes): The raw HTML content of the page at `url`, e.g. from `fetch_many`.
+
+        Returns:
+            dict: A dictionary containing 'title' and 'content' keys. If the HTML is empty or
+            parsing fails, values will be empty strings.
+        """
         if not html:
             return {"title": "", "content": ""}
 
-        title = self._extract_title(html)
-        content = self._extract_text(html)
+        try:
+            # Same decoding as readability: declared charset first, then detection.
+            tree, _ = build_doc(html)
+        except Exception as e:
+            logger.error(f"Error parsing HTML from {self.url}: {e}")
+            return {"title": "", "content": ""}
+
+        title = self._extract_title(tree)
+        content = self._extract_text(tree)
 
         return {
             "title": title,
@@ -1,35 +1,226 @@
 import logging
-from transformers import pipeline
+from functools import cached_property, lru_cache
+from itertools import groupby
+from typing import Union
+import torch
+from optimum.onnxruntime import ORTModelForSeq2SeqLM
+from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
 from newsbot.device_config import DeviceManager
 from newsbot import log_config  # Ensure logging is configured
+from newsbot.cache_config import cache, make_key
+from newsbot.model_cache import (
+    load_or_save_model,
+    load_or_save_pretrained,
+    model_path,
+)
 
 
 logger = logging.getLogger(__name__)
 
 
+def _compile_model(model, tokenizer, device: str) -> None:
+    """
+    Compiles the encoder and decoder forward passes separately with torch.compile and runs one
+    warm-up generation so compilation happens at load time rather than on the first article.
+    Falls back to eager execution if the backend cannot compile for `device`.
+
+    On CUDA the encoder also replays CUDA graphs, since truncated articles often share its input
+    shape. The decoder's key/value length grows every step, so it would record a new graph per
+    step instead of replaying one and is compiled in the default mode.
+
+    Args:
+        model: The PyTorch seq2seq model to compile in place.
+        tokenizer: The tokenizer used to build the warm-up input.
+        device (str): One of 'mps', 'cuda', or 'cpu'.
+    """
+    encoder_mode = "reduce-overhead" if device == "cuda" else None
+    encoder, decoder = model.get_encoder(), model.get_decoder()
+    eager_forwards = encoder.forward, decoder.forward
+    encoder.forward = torch.compile(encoder.forward, mode=encoder_mode, dynamic=True)
+    decoder.forward = torch.compile(decoder.forward, dynamic=True)
+    try:
+        with torch.inference_mode():
+            inputs = tokenizer("Warm-up.", return_tensors="pt").to(device)
+            model.generate(**inputs, max_length=8, num_beams=4)
+    except Exception as e:
+        logger.warning(f"torch.compile failed on {device}, running eager: {e}")
+        encoder.forward, decoder.forward = eager_forwards
+
+
+@lru_cache(maxsize=None)
+def _get_tokenizer(model_name: str):
+    """
+    Loads the tokenizer once per model name and reuses it for every later Summarizer.
+
+    Args:
+        model_name (str): The name of the Hugging Face model whose tokenizer to load.
+
+    Returns:
+        The tokenizer.
+    """
+    return AutoTokenizer.from_pretrained(model_name)
+
+
+@lru_cache(maxsize=None)
+def _get_model(model_name: str, device: str):
+    """
+    Loads the seq2seq model once per (model_name, device) and reuses it
+    for every later Summarizer in the process, so the weights are only loaded once.
+
+    On CPU the model is exported to ONNX and run through ONNX Runtime, which fuses
+    attention/LayerNorm/GELU kernels and keeps the decoder past key/values between steps.
+    On CUDA and MPS the PyTorch model runs in half precision (bfloat16 on CUDA GPUs that
+    support it, float16 otherwise), compiled with torch.compile.
+
+    The ONNX export and the half-precision model are persisted under the model cache
+    directory after the first load, so later processes skip the export and `from_pretrained`.
+
+    Args:
+        model_name (str): The name of the Hugging Face model to load.
+        device (str): One of 'mps', 'cuda', or 'cpu'.
+
+    Returns:
+        The model, ready for `generate`.
+    """
+    logger.info(f"Loading summarization model {model_name} on {device}")
+    if device == "cpu":
+        model = load_or_save_pretrained(
+            model_path(model_name, "-onnx"),
+            lambda path: ORTModelForSeq2SeqLM.from_pretrained(
+                path, use_cache=True, provider="CPUExecutionProvider"
+            ),
+            lambda: ORTModelForSeq2SeqLM.from_pretrained(
+                model_name, export=True, use_cache=True, provider="CPUExecutionProvider"
+            ),
+        )
+    else:
+        dtype = (
+            torch.bfloat16
+            if device == "cuda" and torch.cuda.is_bf16_supported()
+            else torch.float16
+        )
+        model = load_or_save_model(
+            model_path(model_name, f"-{str(dtype).removeprefix('torch.')}.pt"),
+            lambda: AutoModelForSeq2SeqLM.from_pretrained(model_name, dtype=dtype),
+            device,
+        )
+        model.eval()
+        _compile_model(model, _get_tokenizer(model_name), device)
+    return model
+
+
 class Summarizer:
     """
     A class for extracting and summarizing text content from a given URL using a Hugging Face summarization model.
 
     Attributes:
-        url (str): The URL of the page to summarize.
+        url (str or None): The URL of the page to summarize with `run`, used in log messages.
+        model_name (str): The name of the Hugging Face summarization model.
         device (torch.device or str): The device identifier for running the model (e.g., CPU or GPU).
-        model: The Hugging Face summarization pipeline.
+        model: The seq2seq model (ONNX Runtime on CPU, half-precision PyTorch on CUDA/MPS) used for generation,
+            loaded on first access.
+        tokenizer: The tokenizer matching `model`.
 
     Args:
-        url (str): The URL of the page to summarize.
+        url (str, optional): The URL of the page to summarize with `run`. Batches pass the URL of
+            each content to `run_batch` instead. Defaults to None.
         model_name (str, optional): The name of the Hugging Face summarization model to use. Defaults to "facebook/bart-large-cnn".
 
     """
 
-    def __init__(self, url: str, model_name: str = "facebook/bart-large-cnn"):
+    def __init__(
+        self,
+        url: Union[str, None] = None,
+        model_name: str = "facebook/bart-large-cnn",
+    ):
         self.url = url
+        self.model_name = model_name
         self.device = DeviceManager.get_torch_type()
-        self.model = pipeline(
-            "summarization",
-            model=model_name,
-            device=self.device,
-        )
+        self.tokenizer = _get_tokenizer(model_name)
+
+    @cached_property
+    def model(self):
+        """
+        Loads the model on first use, so a Summarizer that never generates (e.g., when
+        every summary is already cached) never loads the weights.
+        """
+        return _get_model(self.model_name, self.device)
+
+    def _tokenize(self, texts: list[str]) -> list[list[int]]:
+        """
+        Tokenizes texts once, truncated to the model's encoder limit (1024 tokens for BART).
+
+        Args:
+            texts (list[str]): The input texts to be tokenized.
+
+        Returns:
+            list[list[int]]: The unpadded token ids of each text.
+        """
+        return self.tokenizer(
+            texts, truncation=True, max_length=self.tokenizer.model_max_length
+        )["input_ids"]
+
+    def _summarize_batch(
+        self,
+        texts: list[str],
+        input_ids: list[list[int]],
+        max_length: int,
+        min_length: int,
+        urls: Union[list[str], None] = None,
+    ) -> list[str]:
+        """
+        Generates summaries for several texts in a single padded `generate` call.
+        Summaries already on disk for the same text, model and lengths are not regenerated.
+
+        Args:
+            texts (list[str]): The input texts to be summarized.
+            input_ids (list[list[int]]): The token ids of `texts`, as returned by `_tokenize`.
+            max_length (int): The maximum length of each generated summary.
+            min_length (int): The minimum length of each generated summary.
+            urls (list[str], optional): The URL of each text, used in log messages.
+                Defaults to `url` for every text.
+
+        Returns:
+            list[str]: The summaries in input order if successful, otherwise empty strings.
+        """
+        keys = [
+            make_key("summary", self.model_name, max_length, min_length, text)
+            for text in texts
+        ]
+        summaries = [cache.get(key, default="") for key in keys]
+        missing = [i for i, summary in enumerate(summaries) if not summary]
+        urls = urls or [self.url or "<no url>"] * len(texts)
+        if not missing:
+            logger.info(f"Summaries loaded from cache: {', '.join(urls)}")
+            return summaries
+
+        missing_urls = ", ".join(urls[i] for i in missing)
+
+        try:
+            inputs = self.tokenizer.pad(
+                {"input_ids": [input_ids[i] for i in missing]}, return_tensors="pt"
+            ).to(self.model.device)
+            with torch.inference_mode():
+                summary_ids = self.model.generate(
+                    **inputs,
+                    max_length=max_length,
+                    min_length=min_length,
+                    num_beams=4,
+                    early_stopping=True,
+                    do_sample=False,
+                )
+            decoded = self.tokenizer.batch_decode(summary_ids, skip_special_tokens=True)
+            for i, summary in zip(missing, decoded):
+                summaries[i] = summary
+                cache.set(keys[i], summary)
+            logger.info(
+                f"{len(missing)} page(s) summarized successfully: {missing_urls}"
+            )
+        except Exception as e:
+            logger.error(
+                f"Error during summarization {missing_urls}: {type(e).__name__}: {e}"
+            )
+        return summaries
 
     def _summarize(self, text: str, max_length: int, min_length: int) -> str:
         """
@@ -43,38 +234,32 @@ class Summarizer:
         Returns:
             str: The summarized text if successful, otherwise an empty string.
         """
-        try:
-            summary = self.model(
-                text, max_length=max_length, min_length=min_length, do_sample=False
-            )
-            logger.info(f"Page summarized successfully: {self.url}")
-            return summary[0]["summary_text"]
-        except Exception as e:
-            logger.error(
-                f"Error during summarization {self.url}: {type(e).__name__}: {e}"
-            )
-            return ""
+        input_ids = self._tokenize([text])
+        return self._summarize_batch([text], input_ids, max_length, min_length)[0]
 
     def _get_summary_lengths(
-        self, text: str, max_cap: int = 250, min_floor: int = 30, ratio: float = 0.4
+        self,
+        token_count: int,
+        max_cap: int = 250,
+        min_floor: int = 30,
+        ratio: float = 0.4,
     ) -> tuple:
         """
-        Calculates dynamic maximum and minimum summary lengths based on the input text and provided constraints.
+        Calculates dynamic maximum and minimum summary lengths based on the input token count and provided constraints.
 
         Args:
-            text (str): The input text to be summarized.
-            max_cap (int, optional): The upper limit for the maximum summary length. Defaults to 150.
+            token_count (int): The number of input tokens the model will actually encode.
+            max_cap (int, optional): The upper limit for the maximum summary length. Defaults to 250.
             min_floor (int, optional): The lower limit for the minimum summary length. Defaults to 30.
-            ratio (float, optional): The ratio of the input text's word count to use for the maximum summary length.
-            Defaults to 0.3.
+            ratio (float, optional): The ratio of the input token count to use for the maximum summary length.
+            Defaults to 0.4.
 
         Returns:
             tuple: A tuple (max_length, min_length) where:
                 - max_length (int): The calculated maximum summary length, constrained by `max_cap` and `ratio`.
                 - min_length (int): The calculated minimum summary length, constrained by `min_floor` and `max_length`.
         """
-        word_count = len(text.split())
-        dynamic_max = int(word_count * ratio)
+        dynamic_max = int(token_count * ratio)
 
         max_length = min(dynamic_max, max_cap)
         min_length = (
@@ -95,5 +280,52 @@ class Summarizer:
         Returns:
             str: The summarized text if content is found; otherwise, an empty string.
         """
-        max_length, min_length = self._get_summary_lengths(content)
-        return self._summarize(content, max_length, min_length)
+        input_ids = self._tokenize([content])
+        max_length, min_length = self._get_summary_lengths(len(input_ids[0]))
+        return self._summarize_batch([content], input_ids, max_length, min_length)[0]
+
+    def run_batch(
+        self,
+        contents: list[str],
+        batch_size: int = 8,
+        urls: Union[list[str], None] = None,
+    ) -> list[str]:
+        """
+        Generates summaries for several text contents, batching them through the model.
+
+        Contents are tokenized once and sorted by token count before batching so that each
+        batch pads to a similar size. A batch only holds contents with the same length bounds,
+        so each summary (and its cache entry) does not depend on what it was batched with.
+
+        Args:
+            contents (list[str]): The contents to be summarized.
+            batch_size (int, optional): The number of contents per forward pass. Defaults to 8.
+            urls (list[str], optional): The URL each content was scraped from, used in log
+                messages. Defaults to `url` for every content.
+
+        Returns:
+            list[str]: The summaries in the same order as `contents`; empty strings on failure.
+        """
+        if not contents:
+            return []
+        input_ids = self._tokenize(contents)
+        urls = urls or [self.url or "<no url>"] * len(contents)
+        summaries = [""] * len(contents)
+        order = sorted(range(len(contents)), key=lambda i: len(input_ids[i]))
+        # The bounds grow with the token count, so equal bounds are adjacent in `order`.
+        for (max_length, min_length), group in groupby(
+            order, key=lambda i: self._get_summary_lengths(len(input_ids[i]))
+        ):
+            group = list(group)
+            for start in range(0, len(group), batch_size):
+                indices = group[start : start + batch_size]
+                batch = self._summarize_batch(
+                    [contents[i] for i in indices],
+                    [input_ids[i] for i in indices],
+                    max_length,
+                    min_length,
+                    [urls[i] for i in indices],
+                )
+                for i, summary in zip(indices, batch):
+                    summaries[i] = summary
+        return summaries
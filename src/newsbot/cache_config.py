@@ -0,0 +1,34 @@
+import hashlib
+from pathlib import Path
+from diskcache import Cache
+
+"""
+This module configures the on-disk cache shared by the scraper, summarizer and evaluator.
+
+Usage:
+    Import `cache` and derive keys with `make_key` so that identical inputs map to the same entry:
+        from newsbot.cache_config import cache, make_key
+        key = make_key("summary", model_name, text)
+    Repeat runs over the same pages then read results from disk instead of recomputing them.
+"""
+CACHE_DIR = Path.home() / ".cache" / "digestbot"
+HTML_EXPIRE_SECONDS = 3600
+
+cache = Cache(str(CACHE_DIR))
+
+
+def make_key(*parts) -> str:
+    """
+    Derives a content-addressed cache key from the given parts.
+
+    Args:
+        *parts: The values identifying the cached result (e.g., a kind tag, model name and input text).
+
+    Returns:
+        str: The hex BLAKE2b digest of the parts.
+    """
+    digest = hashlib.blake2b(digest_size=32)
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
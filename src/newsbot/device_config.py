@@ -1,17 +1,38 @@
 import logging
+from functools import lru_cache
 import torch
 from newsbot import log_config  # Ensure logging is configured
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _detect_device() -> torch.device:
+    """
+    Probes the available backends once and returns the best torch.device.
+    The probes initialize the device drivers, so the result is cached for the process.
+
+    Returns:
+        torch.device: One of 'mps', 'cuda', or 'cpu'.
+    """
+    if torch.backends.mps.is_available():
+        logger.info("Using MPS device")
+        return torch.device("mps")
+    if torch.cuda.is_available():
+        device_name = torch.cuda.get_device_name(0)
+        logger.info(f"Using CUDA device: {device_name}")
+        return torch.device("cuda")
+    logger.info("Using CPU device")
+    return torch.device("cpu")
+
+
 class DeviceManager:
     """
-    Manages the torch device selection and ensures the device type is logged only once.
+    Manages the torch device selection. The device is detected once at import.
     """
 
-    _device = None
-    _device_string = None
+    _device = _detect_device()
+    _device_string = _device.type
 
     @classmethod
     def override_device(cls) -> None:
@@ -25,41 +46,19 @@ class DeviceManager:
     @classmethod
     def get_torch_device(cls) -> torch.device:
         """
-        Lazily determines and returns the best available torch.device.
-        Logs the selected device only on first access.
+        Returns the torch.device selected at import (or CPU after `override_device`).
 
         Returns:
             torch.device: One of 'mps', 'cuda', or 'cpu'.
         """
-        if cls._device is not None:
-            return cls._device
-
-        if torch.backends.mps.is_available():
-            cls._device = torch.device("mps")
-            logger.info("Using MPS device")
-        elif torch.cuda.is_available():
-            device_name = torch.cuda.get_device_name(0)
-            cls._device = torch.device("cuda")
-            logger.info(f"Using CUDA device: {device_name}")
-        else:
-            cls._device = torch.device("cpu")
-            logger.info("Using CPU device")
-
         return cls._device
 
     @classmethod
     def get_torch_type(cls) -> str:
         """
-        Lazily determines and returns the device string.
-        Logs the selected string only on first access.
+        Returns the device string selected at import (or 'cpu' after `override_device`).
 
         Returns:
             str: One of 'mps', 'cuda', or 'cpu'.
         """
-        if cls._device_string is not None:
-            return cls._device_string
-
-        # Call get_device to ensure logging is consistent
-        device = cls.get_torch_device()
-        cls._device_string = device.type
         return cls._device_string
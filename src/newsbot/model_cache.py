@@ -0,0 +1,107 @@
+import logging
+import shutil
+from pathlib import Path
+from typing import Callable
+import torch
+
+"""
+This module persists prepared copies of the summarizer and evaluator models.
+
+Usage:
+    Resolve where a prepared model lives with `model_path`, then load it with `load_or_save_model`:
+        from newsbot.model_cache import load_or_save_model, model_path
+        model = load_or_save_model(model_path(model_name, ".pt"), build, device)
+    Models that must be saved with `save_pretrained` use `load_or_save_pretrained` instead.
+    Later processes then load the prepared copy instead of repeating `from_pretrained`.
+"""
+# Kept apart from the diskcache store in `cache_config.CACHE_DIR`, since models take gigabytes.
+MODEL_CACHE_DIR = Path.home() / ".cache" / "digestbot-models"
+
+logger = logging.getLogger(__name__)
+
+
+def model_path(model_name: str, suffix: str) -> Path:
+    """
+    Returns where a prepared copy of a model is persisted.
+
+    Args:
+        model_name (str): The Hugging Face model name (e.g., "facebook/bart-large-cnn").
+        suffix (str): Distinguishes the prepared variant (e.g., "-float16.pt" or "-onnx").
+
+    Returns:
+        Path: A path under `MODEL_CACHE_DIR`, with "/" in the model name replaced by "--".
+    """
+    MODEL_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    return MODEL_CACHE_DIR / f"{model_name.replace('/', '--')}{suffix}"
+
+
+def load_or_save_model(path: Path, build: Callable, device) -> torch.nn.Module:
+    """
+    Loads a pickled model from `path`, or builds it and pickles it there for the next run.
+
+    The pickle is memory-mapped on load, so weights are paged straight from the file to the
+    device instead of being copied into anonymous RAM first, and no config parsing or shard
+    concatenation is repeated. A pickle that no longer loads (e.g., after a library upgrade)
+    is rebuilt. Persisting is only an optimisation: if the save fails (e.g., the disk is full),
+    a warning is logged and the built model is still returned.
+
+    Args:
+        path (Path): The pickle location, as returned by `model_path`.
+        build (Callable): Builds the model on CPU, e.g. via `from_pretrained`.
+        device: The torch device (or device string) to load the model onto.
+
+    Returns:
+        torch.nn.Module: The model on `device`.
+    """
+    if path.exists():
+        try:
+            # The pickle is written by this module, so full unpickling is trusted.
+            return torch.load(path, map_location=device, mmap=True, weights_only=False)
+        except Exception as e:
+            logger.warning(f"Could not load cached model {path}, rebuilding: {e}")
+    model = build()
+    # Write next to the target and rename, so an interrupted save never leaves a partial file.
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    try:
+        torch.save(model, tmp_path)
+        tmp_path.replace(path)
+    except Exception as e:
+        logger.warning(f"Could not persist model to {path}: {e}")
+        tmp_path.unlink(missing_ok=True)
+    return model.to(device)
+
+
+def load_or_save_pretrained(path: Path, load: Callable, build: Callable):
+    """
+    Loads a model saved with `save_pretrained` from `path`, or builds it and saves it there.
+
+    The directory is written under a temporary name and renamed into place once complete, so
+    a process killed mid-save does not leave a half-written copy behind. A copy that no longer
+    loads is removed and rebuilt. If the save fails, a warning is logged and the built model is
+    still returned.
+
+    Args:
+        path (Path): The directory location, as returned by `model_path`.
+        load (Callable): Loads the model from a directory, e.g. via `from_pretrained(path)`.
+        build (Callable): Builds the model from the hub, e.g. via `from_pretrained(model_name)`.
+
+    Returns:
+        The loaded or freshly built model.
+    """
+    if path.exists():
+        try:
+            return load(path)
+        except Exception as e:
+            logger.warning(f"Could not load cached model {path}, rebuilding: {e}")
+            shutil.rmtree(path, ignore_errors=True)
+    model = build()
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    try:
+        model.save_pretrained(tmp_path)
+        # Fails if another process saved the same model first; its copy is kept.
+        tmp_path.rename(path)
+    except Exception as e:
+        logger.warning(f"Could not persist model to {path}: {e}")
+        shutil.rmtree(tmp_path, ignore_errors=True)
+    return model